@@ -9,63 +9,147 @@
 ####   - Analyzes revenue changes between years to pinpoint key drivers.
 ####   - Exports analysis results to an Excel file for further review.
 
+import logging
+import numpy as np
 import pandas as pd
 import os
 from typing import Tuple
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+logger = logging.getLogger(__name__)
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _accumulate_revenue(prop_id, tenant_id, year_idx, rev, acc):
+        for i in range(len(rev)):
+            acc[prop_id[i], tenant_id[i], year_idx[i]] += rev[i]
+
 
 def load_and_preprocess_data(file_path: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """Loads data from Excel, reshapes it, and performs initial calculations."""
     try:
-        df = pd.read_excel(file_path)
-        print("Columns in the dataset:", df.columns)
+        try:
+            # calamine (Rust-based) parses XLSX several times faster than openpyxl
+            df = pd.read_excel(file_path, engine="calamine")
+        except ImportError:
+            df = pd.read_excel(file_path)
+        logger.debug("Columns in the dataset: %s", list(df.columns))
+
+        # Reuse the melted frame from a Parquet cache when the workbook is unchanged
+        parquet_path = file_path + ".long.parquet"
+        if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(file_path):
+            return pd.read_parquet(parquet_path), df
+
+        # The wide columns are a small fixed set of date headers: parse each
+        # label once and map the years on, instead of to_datetime over every row
+        year_map = {}
+        for col in df.columns:
+            if col in ('tenant', 'property'):
+                continue
+            try:
+                year_map[col] = pd.Timestamp(col).year
+            except (TypeError, ValueError):
+                pass  # non-date column; excluded from the melt below
+
+        df_long = pd.melt(df, id_vars=['tenant', 'property'], value_vars=list(year_map),
+                          var_name='Date', value_name='Revenue')
+        df_long['Year'] = df_long['Date'].map(year_map).astype('int16')
 
-        df_long = pd.melt(df, id_vars=['tenant', 'property'], var_name='Date', value_name='Revenue')
-        df_long['Date'] = pd.to_datetime(df_long['Date'], errors='coerce')
-        df_long['Year'] = df_long['Date'].dt.year
+        # Repeated strings become integer category codes: groupbys and filters
+        # on these keys hash small ints instead of Python strings
+        df_long['property'] = df_long['property'].astype('category')
+        df_long['tenant'] = df_long['tenant'].astype('category')
+
+        try:
+            df_long.to_parquet(parquet_path)
+        except Exception:
+            pass  # no parquet engine installed; the cache is best-effort
 
         return df_long, df
     except FileNotFoundError:
-        print(f"Error: File not found at {file_path}")
+        logger.error(f"Error: File not found at {file_path}")
         return pd.DataFrame(), pd.DataFrame()  # Return empty DataFrames
     except Exception as e:
-        print(f"Error loading and preprocessing data: {e}")
+        logger.error(f"Error loading and preprocessing data: {e}")
         return pd.DataFrame(), pd.DataFrame()
 
 
 def calculate_annual_revenue(df_long: pd.DataFrame) -> pd.DataFrame:
     """Calculates annual revenue by property."""
-    annual_revenue = df_long.groupby(['property', 'Year'])['Revenue'].sum().reset_index()
+    annual_revenue = df_long.groupby(['property', 'Year'], observed=True, sort=False)['Revenue'].sum().reset_index()
     annual_revenue = annual_revenue.sort_values(['property', 'Year'])
-    annual_revenue['Revenue_Change'] = annual_revenue.groupby('property')['Revenue'].diff()  # Annual Change
+    annual_revenue['Revenue_Change'] = annual_revenue.groupby('property', observed=True, sort=False)['Revenue'].diff()  # Annual Change
     return annual_revenue
 
 
 def calculate_top_tenants(df_long: pd.DataFrame) -> pd.DataFrame:
     """Calculates top 10 tenants per property."""
-    tenant_revenue = df_long.groupby(['property', 'tenant'])['Revenue'].sum().reset_index()
+    tenant_revenue = df_long.groupby(['property', 'tenant'], observed=True, sort=False)['Revenue'].sum().reset_index()
     return tenant_revenue
 
 
-def tenant_change_analysis(tenant_annual_rev: pd.DataFrame, prop: str, year: int) -> pd.DataFrame:
-    """Analyzes tenant revenue changes between two years for a given property."""
-    current = tenant_annual_rev[(tenant_annual_rev['property'] == prop) & (tenant_annual_rev['Year'] == year)]
-    previous = tenant_annual_rev[(tenant_annual_rev['property'] == prop) & (tenant_annual_rev['Year'] == year - 1)]
-    comparison = pd.merge(current, previous, on='tenant', how='outer', suffixes=('_curr', '_prev')).fillna(0)
-    comparison['Revenue_Change'] = comparison['Revenue_curr'] - comparison['Revenue_prev']
-    return comparison.sort_values(by='Revenue_Change', ascending=False)
+def topk(df: pd.DataFrame, col: str, k: int, largest: bool = True) -> pd.DataFrame:
+    """Selects the k rows with the largest (or smallest) values in col.
+
+    Uses np.argpartition (O(n)) to pick the survivors and only sorts those,
+    instead of nlargest/nsmallest sorting the whole column.
+    """
+    values = df[col].to_numpy()
+    if len(values) > k:
+        idx = np.argpartition(values, -k)[-k:] if largest else np.argpartition(values, k)[:k]
+        df = df.iloc[idx]
+    return df.sort_values(col, ascending=not largest)
+
+
+def top10_by_property(tenant_revenue: pd.DataFrame) -> dict:
+    """Splits the top 10 tenants by revenue into one DataFrame per property."""
+    return {prop: topk(grp, 'Revenue', 10)
+            for prop, grp in tenant_revenue.groupby('property', observed=True, sort=False)}
 
 
 def calculate_tenant_changes(df_long: pd.DataFrame) -> dict:
     """Calculates tenant revenue changes for each property and year."""
-    tenant_annual_rev = df_long.groupby(['property', 'Year', 'tenant'])['Revenue'].sum().reset_index()
+    # Factorize the keys into dense integer ids and accumulate revenue into a
+    # (property, tenant, year) array in a single pass; the year-over-year
+    # change is then an array diff. A Numba kernel does the accumulation when
+    # numba is installed, with np.bincount as an equivalent fallback.
+    prop_id, props = pd.factorize(df_long['property'], sort=False)
+    tenant_id, tenants = pd.factorize(df_long['tenant'], sort=False)
+    year_idx, years = pd.factorize(df_long['Year'], sort=True)
+    rev = np.nan_to_num(df_long['Revenue'].to_numpy(dtype=np.float64))
+
+    shape = (len(props), len(tenants), len(years))
+    if njit is not None:
+        acc = np.zeros(shape)
+        _accumulate_revenue(prop_id, tenant_id, year_idx, rev, acc)
+    else:
+        flat = (prop_id.astype(np.int64) * shape[1] + tenant_id) * shape[2] + year_idx
+        acc = np.bincount(flat, weights=rev, minlength=shape[0] * shape[1] * shape[2]).reshape(shape)
+
+    # Only (property, tenant) pairs that actually occur in the data
+    present = np.zeros(shape[:2], dtype=bool)
+    present[prop_id, tenant_id] = True
+
+    tenant_names = np.asarray(tenants)
     tenant_change_results = {}
-    for prop in tenant_annual_rev['property'].unique():
-        years = sorted(tenant_annual_rev[tenant_annual_rev['property'] == prop]['Year'].unique())
-        for i in range(1, len(years)):
-            change_df = tenant_change_analysis(tenant_annual_rev, prop, years[i])
-            key = f"{prop}: {years[i - 1]} to {years[i]}"
-            tenant_change_results[key] = change_df
+    for p in range(len(props)):
+        mask = present[p]
+        names = tenant_names[mask]
+        by_year = acc[p][mask]  # (tenants at this property, years)
+        for k in range(1, len(years)):
+            change = by_year[:, k] - by_year[:, k - 1]
+            order = np.argsort(-change)
+            tenant_change_results[f"{props[p]}: {years[k - 1]} to {years[k]}"] = pd.DataFrame({
+                'tenant': names[order],
+                'Revenue_prev': by_year[order, k - 1],
+                'Revenue_curr': by_year[order, k],
+                'Revenue_Change': change[order],
+            })
     return tenant_change_results
 
 
@@ -73,13 +157,28 @@ def export_analysis_results(annual_revenue: pd.DataFrame, tenant_change_results:
     """Exports analysis results to an Excel file."""
     output_file = os.path.join(output_dir, 'analysis_results.xlsx')
     try:
-        with pd.ExcelWriter(output_file) as writer:
+        try:
+            # xlsxwriter is faster than openpyxl for write-only workbooks.
+            # Note: its constant_memory mode cannot be used here - pandas
+            # writes body cells column-by-column, and constant_memory flushes
+            # rows as soon as a later row is touched, silently dropping every
+            # column after the first.
+            writer = pd.ExcelWriter(output_file, engine='xlsxwriter')
+        except ImportError:
+            writer = pd.ExcelWriter(output_file)
+        with writer:
             annual_revenue.to_excel(writer, sheet_name='Annual_Revenue', index=False)
+            seen = {'Annual_Revenue'}
             for key, change_df in tenant_change_results.items():
-                sheet_name = key.replace(" ", "").replace(":", "_")
-                if len(sheet_name) > 31:
-                    sheet_name = sheet_name[:31]
+                sheet_name = key.replace(" ", "").replace(":", "_")[:31]
+                # De-duplicate names that collide after the 31-char truncation
+                base, n = sheet_name, 1
+                while sheet_name in seen:
+                    suffix = f"_{n}"
+                    sheet_name = base[:31 - len(suffix)] + suffix
+                    n += 1
+                seen.add(sheet_name)
                 change_df.to_excel(writer, sheet_name=sheet_name, index=False)
-        print(f"\nAnalysis results exported to '{output_file}'.")
+        logger.info(f"Analysis results exported to '{output_file}'.")
     except Exception as e:
-        print(f"Error exporting analysis results: {e}")
\ No newline at end of file
+        logger.error(f"Error exporting analysis results: {e}")
\ No newline at end of file
@@ -9,9 +9,35 @@
 #### You may experiment tweaking 'system_prompt' below to customize the end result.
 
 
+import hashlib
+import json
+import os
 import requests
 import logging
 
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Module-level session so TCP connections are pooled and reused across calls
+# instead of being re-established for every prompt. Sized to match the
+# concurrent dispatch in report_generation.
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=16,
+                                      max_retries=Retry(total=2, backoff_factor=0.5)))
+
+# Disk cache for LLM responses, keyed by sha256(model|temperature|prompt).
+# Identical prompts on later runs return instantly instead of re-querying the
+# model. Set LLM_CACHE=0 to force fresh responses.
+_CACHE_DIR = os.path.join(".", "output", ".llm_cache")
+_CACHE_ENABLED = os.environ.get("LLM_CACHE", "1") != "0"
+_MEMO: dict[str, str] = {}  # in-process tier on top of the disk cache
+
+
+def _cache_file(cache_key: str) -> str:
+    return os.path.join(_CACHE_DIR, cache_key + ".txt")
+
 
 def query_llm(prompt: str, model: str, temperature: float, max_tokens: int) -> str | None:
     """Queries local LLM with data-focused prompting."""
@@ -26,25 +52,54 @@ def query_llm(prompt: str, model: str, temperature: float, max_tokens: int) -> s
 
     full_prompt = f"{system_prompt}\n\n{prompt}"
 
+    cache_key = hashlib.sha256(f"{model}|{temperature}|{full_prompt}".encode()).hexdigest()
+    if _CACHE_ENABLED:
+        if cache_key in _MEMO:
+            return _MEMO[cache_key]
+        if os.path.exists(_cache_file(cache_key)):
+            with open(_cache_file(cache_key), 'r') as f:
+                cached = f.read()
+            _MEMO[cache_key] = cached
+            return cached
+
     try:
-        response = requests.post(
+        response = _SESSION.post(
             "http://localhost:11434/api/generate",
             json={
                 "model": model,
                 "prompt": full_prompt,
                 "temperature": temperature,
                 "max_tokens": max_tokens,
-                "stream": False
+                # Stream tokens as the model produces them so the client
+                # decodes while the server is still generating
+                "stream": True,
+                "keep_alive": "30m",  # keep the model resident between calls
+                "options": {"num_ctx": 4096}
             },
-            timeout=120
+            timeout=120,
+            stream=True
         )
         response.raise_for_status()
-        return response.json().get("response", "").strip()
+        chunks = []
+        for line in response.iter_lines():
+            if not line:
+                continue
+            obj = json.loads(line)
+            chunks.append(obj.get("response", ""))
+            if obj.get("done"):
+                break
+        result = "".join(chunks).strip()
+        if _CACHE_ENABLED and result:
+            _MEMO[cache_key] = result
+            os.makedirs(_CACHE_DIR, exist_ok=True)
+            tmp_file = _cache_file(cache_key) + ".tmp"
+            with open(tmp_file, 'w') as f:
+                f.write(result)
+            os.replace(tmp_file, _cache_file(cache_key))  # atomic publish
+        return result
     except requests.exceptions.RequestException as e:
-        logging.error(f"Error querying LLM (Connection Error): {e}")
-        print(f"Error querying LLM (Connection Error): {e}")
+        logger.error(f"Error querying LLM (Connection Error): {e}")
         return None
     except Exception as e:
-        logging.error(f"Error querying LLM: {e}")
-        print(f"Error querying LLM: {e}")
+        logger.error(f"Error querying LLM: {e}")
         return None
\ No newline at end of file
@@ -10,31 +10,43 @@
 
 
 import os
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List
 from analysis.data_processing import load_and_preprocess_data, calculate_annual_revenue, \
-    calculate_top_tenants, calculate_tenant_changes, export_analysis_results
+    calculate_top_tenants, calculate_tenant_changes, export_analysis_results, top10_by_property, topk
 from analysis.llm_interaction import query_llm
 from analysis.visualizations import generate_visualizations
 import logging
 
+logger = logging.getLogger(__name__)
 
-def generate_markdown_report(annual_revenue: pd.DataFrame, tenant_revenue: pd.DataFrame, visualization_paths: Dict[str, List[str]],
+# Number of LLM requests kept in flight at once. The calls are pure HTTP I/O,
+# so threads overlap the round-trips to the Ollama server.
+MAX_LLM_WORKERS = 8
+
+
+def generate_markdown_report(summary: Dict[str, pd.Series], top_tenants_by_prop: Dict[str, pd.DataFrame],
+                             visualization_paths: Dict[str, List[str]],
                              tenant_change_results: Dict, model_name: str, temperature: float, max_tokens: int) -> str:
     """Generates the markdown report content."""
 
-    # Basic Statistics
-    total_revenue = annual_revenue.groupby('Year')['Revenue'].sum()
-    top_properties = annual_revenue.groupby('property')['Revenue'].sum().nlargest(5)
+    # Basic statistics, pre-aggregated by generate_report
+    total_revenue = summary['by_year']
+    top_properties = summary['top5_props']
 
-    # Generate LLM commentary for annual revenue with direct data
+    # Pass 1: collect every prompt up front so all LLM calls can be dispatched
+    # together instead of one blocking round-trip at a time
+    prompts: Dict[str, str] = {}
+
+    # Annual revenue commentary prompt with direct data
     annual_prompt_data = "\n".join(
         [f"- {year}: ${rev:,.0f} ({rev / total_revenue.sum() * 100:.1f}% of total)"
          for year, rev in total_revenue.items()]
     )
 
-    annual_commentary = query_llm(
-        f"""Analyze these annual revenue trends using ONLY the provided data:
+    prompts['annual'] = f"""Analyze these annual revenue trends using ONLY the provided data:
         {annual_prompt_data}
 
         Required analysis:
@@ -46,44 +58,26 @@ def generate_markdown_report(annual_revenue: pd.DataFrame, tenant_revenue: pd.Da
         Output format:
         - Start with overall trend summary
         - Bullet points of key observations
-        - End with largest contributor percentage""", model_name, temperature, max_tokens
-    )
-
-    # Create markdown content
-    md_content = f"""# Executive Sales Report
-
-## Annual Revenue Overview
-![Annual Revenue by Property](visualizations/annual_revenue.png)
-
-{annual_commentary or '*Revenue commentary not available*'}
-
-- Total Revenue by Year:
-{chr(10).join(f'  - **{year}**: ${rev:,.2f}' for year, rev in total_revenue.items())}
-
-- Top 5 Properties by Total Revenue:
-{chr(10).join(f'  - **{prop}**: ${rev:,.2f}' for prop, rev in top_properties.items())}
-
-## Tenant Performance
-"""
+        - End with largest contributor percentage"""
 
-    # Add top tenants visualizations with commentary
-    md_content += "\n## Top Tenants by Property\n"
+    # Top tenants prompts, one per property visualization
+    tenant_sections = []  # (prop_name, path) in display order
     for path in visualization_paths['top_tenants']:
         filename = os.path.basename(path).replace('.png', '')
         prop_name = ' '.join(filename.split('_')[2:])
-        prop_data = tenant_revenue[tenant_revenue['property'] == prop_name].nlargest(10, 'Revenue')
+        prop_data = top_tenants_by_prop.get(prop_name)
 
-        if prop_data.empty:
+        if prop_data is None or prop_data.empty:
             continue
 
         total_prop_rev = prop_data['Revenue'].sum()
+        # zip over the raw arrays; iterrows would build a Series per row
         tenant_list = "\n".join(
-            [f"{row['tenant']}: ${row['Revenue']:,.0f} ({row['Revenue'] / total_prop_rev * 100:.1f}%)"
-             for _, row in prop_data.iterrows()]
+            f"{tenant}: ${rev:,.0f} ({rev / total_prop_rev * 100:.1f}%)"
+            for tenant, rev in zip(prop_data['tenant'].to_numpy(), prop_data['Revenue'].to_numpy())
         )
 
-        tenant_commentary = query_llm(
-            f"""Analyze tenant distribution for {prop_name} using:
+        prompts[f"tenants: {prop_name}"] = f"""Analyze tenant distribution for {prop_name} using:
             Total property revenue: ${total_prop_rev:,.0f}
             Tenant breakdown:
             {tenant_list}
@@ -97,36 +91,33 @@ def generate_markdown_report(annual_revenue: pd.DataFrame, tenant_revenue: pd.Da
             Output format:
             - Summary statement
             - Key percentages
-            - Risk assessment""", model_name, temperature, max_tokens
-        )
-
-        md_content += f"\n### {prop_name}\n"
-        md_content += f"![Top Tenants - {prop_name}]({path})\n"
-        md_content += f"{tenant_commentary or '*Tenant analysis unavailable*'}\n"
+            - Risk assessment"""
+        tenant_sections.append((prop_name, path))
 
-    # Add revenue change analysis with direct data
-    md_content += "\n## Significant Revenue Changes\n"
+    # Revenue change prompts, one per (property, year pair)
+    change_sections = []  # (key, prop, years) in display order
     for key in tenant_change_results:
         try:
             prop, years = key.split(": ")
             df = tenant_change_results[key]
 
-            # Get top 5 positive and negative changes
-            top_gains = df.nlargest(3, 'Revenue_Change')
-            top_losses = df.nsmallest(3, 'Revenue_Change')
+            # Get top 3 positive and negative changes
+            top_gains = topk(df, 'Revenue_Change', 3)
+            top_losses = topk(df, 'Revenue_Change', 3, largest=False)
 
             change_data = "Significant Changes:\n"
             change_data += "Growth Contributors:\n" + "\n".join(
-                [f"{row['tenant']}: +${row['Revenue_Change']:,.0f}"
-                 for _, row in top_gains.iterrows() if row['Revenue_Change'] > 1000]
+                f"{tenant}: +${chg:,.0f}"
+                for tenant, chg in zip(top_gains['tenant'].to_numpy(), top_gains['Revenue_Change'].to_numpy())
+                if chg > 1000
             ) + "\n"
             change_data += "Significant Losses:\n" + "\n".join(
-                [f"{row['tenant']}: -${abs(row['Revenue_Change']):,.0f}"
-                 for _, row in top_losses.iterrows() if row['Revenue_Change'] < -1000]
+                f"{tenant}: -${abs(chg):,.0f}"
+                for tenant, chg in zip(top_losses['tenant'].to_numpy(), top_losses['Revenue_Change'].to_numpy())
+                if chg < -1000
             )
 
-            change_commentary = query_llm(
-                f"""Analyze revenue changes for {prop} ({years}):
+            prompts[f"changes: {key}"] = f"""Analyze revenue changes for {prop} ({years}):
                 {change_data}
 
                 Required analysis:
@@ -138,28 +129,69 @@ def generate_markdown_report(annual_revenue: pd.DataFrame, tenant_revenue: pd.Da
                 Output format:
                 - Net change summary
                 - Top 3 contributors
-                - Loss mitigation suggestions""", model_name, temperature, max_tokens
-            )
+                - Loss mitigation suggestions"""
+            change_sections.append((key, prop, years))
+
+        except Exception as e:
+            logger.error(f"Skipping {key} due to error: {str(e)}")
+            continue
 
-            # Find matching visualization
-            safe_prop = prop.replace(" ", "_")
-            safe_years = years.replace(" ", "_").replace(":", "_")
-            pattern = f"top10_changes_{safe_prop}_{safe_years}.png"
-            matches = [p for p in visualization_paths['revenue_changes'] if pattern in p]
+    # Pass 2: dispatch every prompt in parallel so total LLM latency is the
+    # slowest single call rather than the sum of all calls
+    keys = list(prompts)
+    with ThreadPoolExecutor(max_workers=MAX_LLM_WORKERS) as executor:
+        responses = dict(zip(keys, executor.map(
+            lambda p: query_llm(p, model_name, temperature, max_tokens),
+            [prompts[k] for k in keys]
+        )))
 
-            viz_section = ""
-            if matches:
-                path = matches[0]
-                viz_section = f"![Revenue Changes - {prop} ({years})]({path})\n"
+    # Pass 3: assemble the markdown from the cached responses
+    annual_commentary = responses.get('annual')
 
-            md_content += f"\n### {prop} ({years})\n"
-            md_content += viz_section
-            md_content += f"{change_commentary or '*Change analysis unavailable*'}\n"
+    md_content = f"""# Executive Sales Report
 
-        except Exception as e:
-            print(f"Skipping {key} due to error: {str(e)}")
-            logging.error(f"Skipping {key} due to error: {str(e)}")
-            continue
+## Annual Revenue Overview
+![Annual Revenue by Property](visualizations/annual_revenue.png)
+
+{annual_commentary or '*Revenue commentary not available*'}
+
+- Total Revenue by Year:
+{chr(10).join(f'  - **{year}**: ${rev:,.2f}' for year, rev in total_revenue.items())}
+
+- Top 5 Properties by Total Revenue:
+{chr(10).join(f'  - **{prop}**: ${rev:,.2f}' for prop, rev in top_properties.items())}
+
+## Tenant Performance
+"""
+
+    # Add top tenants visualizations with commentary
+    md_content += "\n## Top Tenants by Property\n"
+    for prop_name, path in tenant_sections:
+        tenant_commentary = responses.get(f"tenants: {prop_name}")
+
+        md_content += f"\n### {prop_name}\n"
+        md_content += f"![Top Tenants - {prop_name}]({path})\n"
+        md_content += f"{tenant_commentary or '*Tenant analysis unavailable*'}\n"
+
+    # Add revenue change analysis with direct data
+    md_content += "\n## Significant Revenue Changes\n"
+    for key, prop, years in change_sections:
+        change_commentary = responses.get(f"changes: {key}")
+
+        # Find matching visualization
+        safe_prop = prop.replace(" ", "_")
+        safe_years = years.replace(" ", "_").replace(":", "_")
+        pattern = f"top10_changes_{safe_prop}_{safe_years}.png"
+        matches = [p for p in visualization_paths['revenue_changes'] if pattern in p]
+
+        viz_section = ""
+        if matches:
+            path = matches[0]
+            viz_section = f"![Revenue Changes - {prop} ({years})]({path})\n"
+
+        md_content += f"\n### {prop} ({years})\n"
+        md_content += viz_section
+        md_content += f"{change_commentary or '*Change analysis unavailable*'}\n"
 
     return md_content
 
@@ -170,7 +202,7 @@ def generate_report(file_path: str, output_dir: str, model_name: str, temperatur
     df_long, df = load_and_preprocess_data(file_path)
 
     if df_long.empty or df.empty:
-        print("Failed to load and preprocess data.  Check the file and its format.")
+        logger.error("Failed to load and preprocess data.  Check the file and its format.")
         return None
 
     # Perform calculations
@@ -178,13 +210,27 @@ def generate_report(file_path: str, output_dir: str, model_name: str, temperatur
     tenant_revenue = calculate_top_tenants(df_long)
     tenant_change_results = calculate_tenant_changes(df_long)
 
+    # Slice top-10 tenants per property once; shared by the visualization and
+    # markdown stages so neither re-scans tenant_revenue in its loops
+    top_tenants_by_prop = top10_by_property(tenant_revenue)
+
+    # Roll up the report-header statistics here so the markdown stage only
+    # formats: yearly totals plus the top-5 properties by total revenue
+    prop_totals = annual_revenue.groupby('property', observed=True, sort=False)['Revenue'].sum()
+    k = min(5, len(prop_totals))
+    top5_idx = np.argpartition(-prop_totals.to_numpy(), k - 1)[:k]
+    summary = {
+        'by_year': annual_revenue.groupby('Year', sort=True)['Revenue'].sum(),
+        'top5_props': prop_totals.iloc[top5_idx].sort_values(ascending=False),
+    }
+
     # Export analysis results to Excel
     export_analysis_results(annual_revenue, tenant_change_results, output_dir)
 
     # Generate visualizations
-    visualization_paths = generate_visualizations(annual_revenue, tenant_revenue, tenant_change_results, output_dir)
+    visualization_paths = generate_visualizations(annual_revenue, top_tenants_by_prop, tenant_change_results, output_dir)
 
     # Generate markdown report
-    report_md = generate_markdown_report(annual_revenue, tenant_revenue, visualization_paths,
+    report_md = generate_markdown_report(summary, top_tenants_by_prop, visualization_paths,
                                           tenant_change_results, model_name, temperature, max_tokens)
     return report_md
\ No newline at end of file
@@ -1,13 +1,84 @@
 # analysis/visualizations.py
 import os
 import pandas as pd
-import matplotlib.pyplot as plt
+import matplotlib
+matplotlib.use("Agg")  # headless rendering; never probes for a GUI toolkit
 import seaborn as sns
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from matplotlib.figure import Figure
 from typing import Dict, List
 
+matplotlib.rcParams["path.simplify"] = True
 
-def generate_visualizations(annual_revenue: pd.DataFrame, tenant_revenue: pd.DataFrame,
+# PNGs end up ~6in wide in the Word report, so 96 dpi is plenty
+SAVE_DPI = 96
+
+
+def _plot_annual_revenue(annual_revenue: pd.DataFrame, viz_dir: str) -> str:
+    """Draws the annual revenue by property chart."""
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    sns.barplot(data=annual_revenue, x='property', y='Revenue', hue='Year', palette='viridis', ax=ax)
+    ax.set_title('Annual Revenue by Property')
+    ax.set_xlabel('Property')
+    ax.set_ylabel('Revenue (USD)')
+    for label in ax.get_xticklabels():  # Rotate x-axis labels for better readability
+        label.set_rotation(45)
+        label.set_ha("right")
+    fig.tight_layout()
+    filename = 'annual_revenue.png'
+    fig.savefig(os.path.join(viz_dir, filename), dpi=SAVE_DPI)
+    return f"visualizations/{filename}"  # Relative path
+
+
+def _plot_top_tenants(prop: str, prop_data: pd.DataFrame, viz_dir: str) -> str:
+    """Draws the top-10 tenants chart for one property."""
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    sns.barplot(data=prop_data, x='Revenue', y='tenant', hue='tenant', palette='rocket', legend=False, ax=ax)
+    ax.set_title(f'Top 10 Tenants - {prop}')
+    ax.set_xlabel('Total Revenue (USD)')
+    ax.set_ylabel('Tenant')
+    fig.tight_layout()
+    filename = f'top_tenants_{prop}.png'.replace(" ", "_")
+    fig.savefig(os.path.join(viz_dir, filename), dpi=SAVE_DPI)
+    return f"visualizations/{filename}"  # Relative path
+
+
+def _plot_revenue_changes(key: str, df: pd.DataFrame, viz_dir: str) -> str | None:
+    """Draws the top-10 revenue changes chart for one (property, year pair)."""
+    prop, years = key.split(": ")
+
+    # Partition on |change| to pick the 10 largest movers without a full sort
+    change = df['Revenue_Change'].to_numpy()
+    k = min(10, len(change))
+    if k == 0:
+        return None
+    top_changes = df.iloc[np.argpartition(np.abs(change), len(change) - k)[-k:]]
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    top_changes = top_changes.sort_values('Revenue_Change', ascending=False)
+    sns.barplot(data=top_changes,
+                x='Revenue_Change',
+                y='tenant',
+                palette='coolwarm',
+                hue=np.sign(top_changes['Revenue_Change']),
+                dodge=False,
+                legend=False,  # disable legend
+                ax=ax)
+    ax.set_title(f'Top 10 Revenue Changes: {prop} ({years})')
+    ax.set_xlabel('Revenue Change (USD)')
+    ax.set_ylabel('Tenant')
+    fig.tight_layout()
+    filename = f'top10_changes_{prop}_{years}.png'.replace(" ", "_").replace(":", "_")
+    fig.savefig(os.path.join(viz_dir, filename), dpi=SAVE_DPI)
+    return f"visualizations/{filename}"  # Relative path
+
+
+def generate_visualizations(annual_revenue: pd.DataFrame, top_tenant_data: Dict[str, pd.DataFrame],
                             tenant_change_results: dict, output_dir: str) -> Dict[str, List[str]]:
     """Generates visualizations and saves them to the output directory."""
 
@@ -20,56 +91,19 @@ def generate_visualizations(annual_revenue: pd.DataFrame, tenant_revenue: pd.Dat
         'revenue_changes': []
     }
 
-    # 1. Annual Revenue by Property
-    plt.figure(figsize=(12, 6))
-    sns.barplot(data=annual_revenue, x='property', y='Revenue', hue='Year', palette='viridis')
-    plt.title('Annual Revenue by Property')
-    plt.xlabel('Property')
-    plt.ylabel('Revenue (USD)')
-    plt.xticks(rotation=45, ha="right")  # Rotate x-axis labels for better readability
-    plt.tight_layout()
-    annual_filename = 'annual_revenue.png'
-    plt.savefig(os.path.join(viz_dir, annual_filename))
-    plt.close()
-    visualization_paths['annual_revenue'].append(f"visualizations/{annual_filename}")  # Relative path
-
-    # 2. Top Tenants per Property
-    for prop in tenant_revenue['property'].unique():
-        plt.figure(figsize=(10, 6))
-        prop_data = tenant_revenue[tenant_revenue['property'] == prop].nlargest(10, 'Revenue')
-        sns.barplot(data=prop_data, x='Revenue', y='tenant', hue='tenant', palette='rocket', legend=False)
-        plt.title(f'Top 10 Tenants - {prop}')
-        plt.xlabel('Total Revenue (USD)')
-        plt.ylabel('Tenant')
-        plt.tight_layout()
-        filename = f'top_tenants_{prop}.png'.replace(" ", "_")
-        plt.savefig(os.path.join(viz_dir, filename))
-        plt.close()
-        visualization_paths['top_tenants'].append(f"visualizations/{filename}")  # Relative path
-
-    # 3. Revenue Change Analysis
-    for key in tenant_change_results:
-        prop, years = key.split(": ")
-        df = tenant_change_results[key]
-        top_changes = df.reindex(df['Revenue_Change'].abs().sort_values(ascending=False).index).head(10)
-
-        if not top_changes.empty:
-            plt.figure(figsize=(10, 6))
-            top_changes = top_changes.sort_values('Revenue_Change', ascending=False)
-            sns.barplot(data=top_changes,
-                        x='Revenue_Change',
-                        y='tenant',
-                        palette='coolwarm',
-                        hue=np.sign(top_changes['Revenue_Change']),
-                        dodge=False,
-                        legend=False)  # disable legend
-            plt.title(f'Top 10 Revenue Changes: {prop} ({years})')
-            plt.xlabel('Revenue Change (USD)')
-            plt.ylabel('Tenant')
-            plt.tight_layout()
-            filename = f'top10_changes_{prop}_{years}.png'.replace(" ", "_").replace(":", "_")
-            plt.savefig(os.path.join(viz_dir, filename))
-            plt.close()
-            visualization_paths['revenue_changes'].append(f"visualizations/{filename}")  # Relative path
-
-    return visualization_paths
\ No newline at end of file
+    # One spec per chart; each worker draws on its own Figure object so no
+    # pyplot global state is shared, making the saves safe to parallelize
+    jobs = [('annual_revenue', partial(_plot_annual_revenue, annual_revenue, viz_dir))]
+    for prop, prop_data in top_tenant_data.items():
+        jobs.append(('top_tenants', partial(_plot_top_tenants, prop, prop_data, viz_dir)))
+    for key, df in tenant_change_results.items():
+        jobs.append(('revenue_changes', partial(_plot_revenue_changes, key, df, viz_dir)))
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = [(kind, executor.submit(job)) for kind, job in jobs]
+        for kind, future in futures:
+            path = future.result()
+            if path:
+                visualization_paths[kind].append(path)
+
+    return visualization_paths
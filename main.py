@@ -9,14 +9,16 @@
 ####   - Logging key events and errors throughout the process.
 
 
+import importlib.util
 import os
 import subprocess
 import sys
 import time
 import logging
 
-from md_to_word import convert_md_to_docx
-from analysis.report_generation import generate_report
+# md_to_word and analysis.report_generation are imported inside main() at the
+# point of use: pulling in pandas/matplotlib/seaborn/docx at module load costs
+# seconds of cold start that the "use existing report" path never needs
 
 # Configuration
 file_path = './1k_lines_sales_data.xlsx'
@@ -31,17 +33,14 @@ md_report = os.path.join(output_dir, "executive_report.md")
 
 def check_requirements():
     """Verify required packages are installed"""
-    try:
-        import pandas
-        import docx
-        import matplotlib
-        import seaborn
-        import requests
-        return True
-    except ImportError as e:
-        print(f"Missing requirement: {str(e)}")
+    # find_spec checks availability without importing, so the check stays fast
+    required = ['pandas', 'docx', 'matplotlib', 'seaborn', 'requests']
+    missing = [name for name in required if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"Missing requirement: {', '.join(missing)}")
         print("Please install requirements: pip install -r requirements.txt")
         return False
+    return True
 
 
 def prompt_user(prompt, default=None):
@@ -58,9 +57,9 @@ def prompt_user(prompt, default=None):
 
 
 def main():
-    # Configure logging
+    # Configure logging; module loggers stay quiet unless --verbose is given
     logging.basicConfig(
-        level=logging.INFO,
+        level=logging.INFO if '--verbose' in sys.argv else logging.WARNING,
         format='%(asctime)s - %(levelname)s - %(message)s',
         filename='./report_generator.log'
     )
@@ -86,6 +85,7 @@ def main():
         else:
             print("Regenerating report...")
             logging.info("Regenerating report")
+            from analysis.report_generation import generate_report
             report_md = generate_report(file_path, output_dir, model_name, temperature, max_tokens)
             if report_md:
                 with open(md_report, 'w') as f:
@@ -97,6 +97,7 @@ def main():
     else:
         print("No existing report found - generating new report...")
         logging.info("Generating new report")
+        from analysis.report_generation import generate_report
         report_md = generate_report(file_path, output_dir, model_name, temperature, max_tokens)
         if report_md:
             with open(md_report, 'w') as f:
@@ -109,6 +110,7 @@ def main():
     # Convert to Word
     print("\nConverting markdown to Word document...")
     logging.info("Starting markdown to Word conversion")
+    from md_to_word import convert_md_to_docx
     if convert_md_to_docx(md_report, output_dir):
         print("\nConversion complete!")
         print(f"Word document saved to: {os.path.join(output_dir, 'executive_report.docx')}")
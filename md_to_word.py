@@ -6,13 +6,22 @@
 #### and converts them to their corresponding Word document equivalents.
 
 
+import logging
 import os
 import re
+from io import BytesIO
 
 from docx import Document
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 from docx.shared import Inches, Pt
 
+logger = logging.getLogger(__name__)
+
+# Compiled once at import; these run on every line of the report
+_SECTION_RE = re.compile(r'\n## ')
+_IMG_RE = re.compile(r'!\[(.*?)\]\((.*?)\)')
+_BOLD_RE = re.compile(r'(\*\*.*?\*\*)')
+
 
 def convert_md_to_docx(md_file_path, output_dir, image_dir='visualizations'):
     """Convert markdown report to Word document"""
@@ -29,16 +38,20 @@ def convert_md_to_docx(md_file_path, output_dir, image_dir='visualizations'):
     font.name = 'Calibri'
     font.size = Pt(11)
 
+    # Each image file is read from disk once and embedded from memory;
+    # add_picture otherwise re-opens the file to measure it and again to embed
+    img_cache = {}
+
     # Read markdown content
     try:
         with open(md_file_path, 'r') as f:
             content = f.read()
     except FileNotFoundError:
-        print(f"Error: Markdown file not found at {md_file_path}")
+        logger.error(f"Error: Markdown file not found at {md_file_path}")
         return False
 
     # Split into sections
-    sections = re.split(r'\n## ', content)
+    sections = _SECTION_RE.split(content)
 
     # Process main header
     main_header = sections[0].replace('# ', '').strip()
@@ -57,13 +70,16 @@ def convert_md_to_docx(md_file_path, output_dir, image_dir='visualizations'):
 
             # Handle images
             if line.startswith('!['):
-                alt_text, image_path = re.match(r'!\[(.*?)\]\((.*?)\)', line).groups()
+                alt_text, image_path = _IMG_RE.match(line).groups()
                 full_image_path = os.path.join(output_dir, image_path)
 
                 if os.path.exists(full_image_path):
+                    if full_image_path not in img_cache:
+                        with open(full_image_path, 'rb') as img_file:
+                            img_cache[full_image_path] = img_file.read()
                     para = doc.add_paragraph()
                     run = para.add_run()
-                    run.add_picture(full_image_path, width=Inches(6))
+                    run.add_picture(BytesIO(img_cache[full_image_path]), width=Inches(6))
                     para.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
                     doc.add_paragraph(alt_text, style='Caption')
 
@@ -79,7 +95,7 @@ def convert_md_to_docx(md_file_path, output_dir, image_dir='visualizations'):
             # Handle bold text
             elif '**' in line:
                 p = doc.add_paragraph()
-                for part in re.split(r'(\*\*.*?\*\*)', line):
+                for part in _BOLD_RE.split(line):
                     if part.startswith('**') and part.endswith('**'):
                         run = p.add_run(part[2:-2])
                         run.bold = True
@@ -96,8 +112,8 @@ def convert_md_to_docx(md_file_path, output_dir, image_dir='visualizations'):
     # Save document
     try:
         doc.save(docx_path)
-        print(f"DOCX report saved to '{docx_path}'")
+        logger.info(f"DOCX report saved to '{docx_path}'")
         return True
     except Exception as e:
-        print(f"Error saving DOCX file: {str(e)}")
+        logger.error(f"Error saving DOCX file: {str(e)}")
         return False
\ No newline at end of file